@@ -1,26 +1,29 @@
 # main.py
 import asyncio
+import hashlib
 import json
 import os
 import re
-from typing import Optional, Dict, Any
+import sys
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional, Dict, Any, Tuple
 
 from dotenv import load_dotenv
 
+try:
+    import orjson  # optional: faster JSON parse/serialize
+except ImportError:
+    orjson = None
 
 import typer
 from rich.console import Console
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.table import Table
-from rich.text import Text
 
-
-from google.adk.runners import Runner
-from google.adk.sessions.in_memory_session_service import InMemorySessionService
-from google.genai import types
-
-from political_profiles_agent.agent import root_agent
+# Heavy imports (ADK, genai, the agent tree, rich renderables) are deferred into the
+# functions that use them so `--help` and argument errors start fast.
+if TYPE_CHECKING:
+    from google.adk.runners import Runner
+    from google.adk.sessions.in_memory_session_service import InMemorySessionService
 
 
 load_dotenv()
@@ -29,7 +32,20 @@ app = typer.Typer(add_completion=False, no_args_is_help=True)
 console = Console()
 
 APP_NAME = "PoliticalProfileCLI"
-session_service = InMemorySessionService()
+_session_service: Optional["InMemorySessionService"] = None
+_RUNNER: Optional["Runner"] = None
+# UNIX socket served by profile_daemon.py; main() forwards queries there when it exists
+DAEMON_SOCKET = os.path.join(os.path.expanduser("~"), ".cache", "ppcli.sock")
+# Seconds to wait for the daemon to accept a query, and for the finished profile
+DAEMON_ACK_TIMEOUT = 5.0
+DAEMON_REPLY_TIMEOUT = 300.0
+# Max bytes per protocol line (profiles and tracebacks exceed asyncio's 64 KiB default)
+DAEMON_LINE_LIMIT = 1024 * 1024
+# Recent validated profiles, keyed by (user_id, query digest) -> (stored at, profile).
+# Bounded LRU with a short TTL so long-lived processes (--repl, the daemon) stay current.
+_PROFILE_CACHE: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_PROFILE_CACHE_SIZE = 256
+_PROFILE_CACHE_TTL = 15 * 60  # seconds
 
 STAGE_LABELS = {
     "PoliticalProfileRouter": "Checking the name",
@@ -41,13 +57,73 @@ STAGE_LABELS = {
     "ParallelResearch": "Researching in parallel",
     "ConsolidateNotes": "Combining findings",
     "ExtractProfile": "Creating the profile",
+    "ExtractProfileFull": "Creating the profile (full length)",
+    "CheckProfile": "Checking the profile",
     "ValidateProfile": "Double-checking details",
     "ResearchPipeline": "Building the profile",
 }
+# Agent names used as event authors are interned, so lookups can hit the identity fast path
+STAGE_LABELS = {sys.intern(k): v for k, v in STAGE_LABELS.items()}
+
+# How many streamed events run_pipeline handles before yielding to the event loop
+_EVENTS_PER_YIELD = 8
+
+# Precompiled pattern used by _extract_json
+_FENCE_RE = re.compile(r"^\s*```(?:json|jsonc|json5)?\s*|\s*```", re.IGNORECASE | re.MULTILINE)
+
+
+def _get_session_service() -> "InMemorySessionService":
+    """Create the shared in-memory session service on first use."""
+    global _session_service
+    if _session_service is None:
+        from google.adk.sessions.in_memory_session_service import InMemorySessionService
+
+        _session_service = InMemorySessionService()
+    return _session_service
+
+
+def get_runner() -> "Runner":
+    """Build the Runner (and load the agent tree) once per process."""
+    global _RUNNER
+    if _RUNNER is None:
+        from google.adk.runners import Runner
+
+        from political_profiles_agent.agent import root_agent
+
+        _RUNNER = Runner(
+            app_name=APP_NAME,
+            agent=root_agent,
+            session_service=_get_session_service(),
+        )
+    return _RUNNER
+
+
+def _cached_profile(key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+    entry = _PROFILE_CACHE.get(key)
+    if entry is None:
+        return None
+    stored_at, profile = entry
+    if time.monotonic() - stored_at > _PROFILE_CACHE_TTL:
+        del _PROFILE_CACHE[key]
+        return None
+    _PROFILE_CACHE.move_to_end(key)
+    return profile
+
+
+def _remember_profile(key: Tuple[str, str], profile: Dict[str, Any]) -> None:
+    _PROFILE_CACHE[key] = (time.monotonic(), profile)
+    _PROFILE_CACHE.move_to_end(key)
+    if len(_PROFILE_CACHE) > _PROFILE_CACHE_SIZE:
+        _PROFILE_CACHE.popitem(last=False)
 
 
 def render_profile(profile: Dict[str, Any]) -> None:
     """Pretty print the final validated profile JSON."""
+    from rich.console import Group
+    from rich.panel import Panel
+    from rich.table import Table
+    from rich.text import Text
+
     title = profile.get("title", "").strip()
     bio = profile.get("biography", "").strip()
     current = profile.get("current_status", "").strip()
@@ -63,98 +139,210 @@ def render_profile(profile: Dict[str, Any]) -> None:
     # Biography as a wrapped panel
     bio_panel = Panel.fit(Text(bio or "—"), title="Biography", title_align="left", border_style="blue")
 
-    console.print(Panel.fit(meta_tbl, title=title_text, border_style="green"))
-    console.print(bio_panel)
+    # Render both panels in one print call
+    console.print(Group(Panel.fit(meta_tbl, title=title_text, border_style="green"), bio_panel))
+
+
+def _loads(s: str) -> Any:
+    """
+    Parse JSON with orjson when available, falling back to the stdlib when orjson raises
+    (e.g. NaN/Infinity). Note orjson itself parses integers beyond 64 bits as floats.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(s)
+
+
+def _dumps_indented(obj: Any) -> str:
+    """Pretty-print JSON (indent=2, non-ASCII kept). orjson.dumps returns bytes, so decode to str."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2)
+
+
+def _find_json_span(s: str, start: int = 0) -> Optional[Tuple[int, int]]:
+    """
+    Locate the first balanced JSON object at or after `start`. Only `{` opens a candidate:
+    bracketed citations like `[1]` in a fact sheet are valid JSON lists but never a profile.
+    Braces inside string literals are ignored. Returns (begin, end) slice bounds, or None
+    if there is no `{` or the object is never closed (e.g. truncated output).
+    """
+    begin = s.find("{", start)
+    if begin == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escape = False
+    for i in range(begin, len(s)):
+        ch = s[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return begin, i + 1
+    return None
 
 
 def _extract_json(text: str) -> Optional[Dict[str, Any]]:
     """
-    Extract the first top-level JSON object or array from a string, even if surrounded by ```
-    Returns a dict/list on success, otherwise None.
+    Extract JSON from a string, even if surrounded by ```
+    Returns the parsed value if the whole (unfenced) text is JSON, otherwise the first
+    JSON object embedded in mixed content, otherwise None.
     """
     if not isinstance(text, str) or not text.strip():
         return None
 
+    # Fast path: bare JSON needs no fence stripping or scanning
+    s = text.lstrip()
+    if s[:1] in ("{", "["):
+        try:
+            return _loads(s)
+        except Exception:
+            pass
+
     # Strip common triple-backtick code fences with or without language tags
-    cleaned = re.sub(
-        r"^\s*```(?:json|jsonc|json5)?\s*|\s*```",
-        "",
-        text.strip(),
-        flags=re.IGNORECASE | re.MULTILINE,
-    )
+    cleaned = _FENCE_RE.sub("", text.strip())
 
     # Try a direct parse first
     try:
-        return json.loads(cleaned)
+        return _loads(cleaned)
     except Exception:
         pass
 
-    # Fallback: find the first JSON object or array in mixed content
-    match = re.search(r"(\{.*\}|\[.*\])", cleaned, flags=re.DOTALL)
-    if not match:
-        return None
-    frag = match.group(1)
+    # Fallback: scan for the first balanced JSON object in mixed content
+    pos = 0
+    while True:
+        span = _find_json_span(cleaned, pos)
+        if span is None:
+            return None
+        begin, end = span
+        try:
+            parsed = _loads(cleaned[begin:end])
+        except Exception:
+            parsed = None
+        if isinstance(parsed, dict):
+            return parsed
+        # Resume after the rejected span so the scan stays linear
+        pos = end
+
+
+def print_run_failure(error: str, tb: Optional[str] = None) -> None:
+    """Report a failed pipeline run (tb is only printed when provided)."""
+    console.print(f"[red]Run failed:[/red] {error}")
+    if tb:
+        console.print(f"[red]Traceback:[/red]\n{tb}")
+
+
+async def run_pipeline(query: str) -> Optional[Dict[str, Any]]:
+    """Run build_profile, printing failures instead of raising them."""
     try:
-        return json.loads(frag)
-    except Exception:
+        return await build_profile(query)
+    except Exception as e:
+        tb = None
+        # Full tracebacks are only worth the frame walk when debugging
+        if os.getenv("PPCLI_DEBUG"):
+            import traceback
+            tb = traceback.format_exc()
+        print_run_failure(str(e), tb)
         return None
 
 
-async def run_pipeline(query: str) -> Optional[Dict[str, Any]]:
+async def build_profile(query: str) -> Optional[Dict[str, Any]]:
     """
     Run the ADK pipeline with streaming events to drive a simple spinner UI,
     then return the final validated profile dict from session state.
+    Pipeline errors propagate to the caller.
     """
-    # Create a session and runner
-    session_id = f"session-{abs(hash(query))}"
+    from google.genai import types
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
+    # Stable across runs (unlike hash(), which is salted per process)
+    sid = hashlib.blake2b(query.encode("utf-8"), digest_size=8).hexdigest()
+    session_id = f"session-{sid}"
     user_id = "default_user"
-    await session_service.create_session(app_name=APP_NAME, user_id=user_id, session_id=session_id)
 
-    runner = Runner(
-        app_name=APP_NAME,
-        agent=root_agent,
-        session_service=session_service,
-    )
+    # Repeat query in this process (e.g. --repl): skip the pipeline entirely
+    cached = _cached_profile((user_id, sid))
+    if cached is not None:
+        return cached
+
+    runner = get_runner()
+    session_service = _get_session_service()
 
-    # One-line spinner with evolving stage text
+    # Create a fresh session per query; replaces any stale session from a failed run
+    if await session_service.get_session(app_name=APP_NAME, user_id=user_id, session_id=session_id):
+        await session_service.delete_session(app_name=APP_NAME, user_id=user_id, session_id=session_id)
+    await session_service.create_session(app_name=APP_NAME, user_id=user_id, session_id=session_id)
+
+    # One-line spinner with evolving stage text; redraws coalesced to 4/s
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         transient=True,  # clears line when done
         console=console,
+        auto_refresh=True,
+        refresh_per_second=4,
     ) as progress:
         task_id = progress.add_task(description="Starting…", total=None)
 
-        try:
-            # Create a proper Content object for the message
-            message_content = types.Content(
-                role="user",
-                parts=[types.Part(text=query)]
-            )
-            
-            # Stream events; update spinner text when we see known authors/stages
-            async for event in runner.run_async(
-                user_id=user_id,
-                session_id=session_id,
-                new_message=message_content
-            ):
-                author = getattr(event, "author", None) or ""
-                if author in STAGE_LABELS:
-                    progress.update(task_id, description=STAGE_LABELS[author])
-                # If tools or sub‑agents emit granular authors, surface the most recent meaningful one
-                elif author:
-                    progress.update(task_id, description=f"Working: {author}")
-        except Exception as e:
-            progress.update(task_id, description="Error")
-            console.print(f"[red]Run failed:[/red] {e}")
-            import traceback
-            console.print(f"[red]Traceback:[/red]\n{traceback.format_exc()}")
-            return None
+        # Create a proper Content object for the message
+        message_content = types.Content(
+            role="user",
+            parts=[types.Part(text=query)]
+        )
+
+        # Stream events; update spinner text only when the author changes
+        last_author = None
+        events_since_yield = 0
+        async for event in runner.run_async(
+            user_id=user_id,
+            session_id=session_id,
+            new_message=message_content
+        ):
+            # Periodically hand the loop to other tasks (e.g. the Router's prefetch)
+            events_since_yield += 1
+            if events_since_yield >= _EVENTS_PER_YIELD:
+                events_since_yield = 0
+                await asyncio.sleep(0)
+
+            author = getattr(event, "author", None) or ""
+            if not author or author == last_author:
+                continue
+            last_author = author
+            label = STAGE_LABELS.get(author)
+            # If tools or sub‑agents emit granular authors, surface the most recent meaningful one
+            progress.update(task_id, description=label if label is not None else f"Working: {author}")
 
     # After run completes, the session state should contain the validated output under output_key
     session = await session_service.get_session(app_name=APP_NAME, user_id=user_id, session_id=session_id)
     state = getattr(session, "state", {}) or {}
 
+    result = _profile_from_state(state)
+    # Only memoize validated profiles, not router messages or plain-text fallbacks
+    if result is not None and isinstance(state.get("final_profile"), dict):
+        _remember_profile((user_id, sid), result)
+    return result
+
+
+def _profile_from_state(state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Pick the best available profile (or router message) from session state as a dict."""
     # Quick path: the router produced a friendly message for non‑politicians
     final_message = state.get("final_message")
     if final_message:
@@ -175,7 +363,7 @@ async def run_pipeline(query: str) -> Optional[Dict[str, Any]]:
         if parsed is not None:
             # If it's a list (unexpected), wrap or coerce into the expected dict shape
             if isinstance(parsed, list):
-                return {"title": "Profile", "biography": json.dumps(parsed, ensure_ascii=False, indent=2), "current_status": "Unknown"}
+                return {"title": "Profile", "biography": _dumps_indented(parsed), "current_status": "Unknown"}
             if isinstance(parsed, dict):
                 return parsed
         console.print(f"[yellow]Profile is plain text, wrapping in dict[/yellow]")
@@ -195,28 +383,133 @@ async def run_pipeline(query: str) -> Optional[Dict[str, Any]]:
             return None
 
 
-@app.command(help="Build a concise, validated profile of an Indian politician.")
-def main(
-    name: str = typer.Option(None, "--name", "-n", help="Politician name (if omitted, will prompt)"),
-):
-    # Prompt interactively if not provided as an arg
-    if not name:
-        name = typer.prompt("Enter the politician's name")
+async def _read_daemon_line(reader: asyncio.StreamReader, timeout: float) -> Dict[str, Any]:
+    line = await asyncio.wait_for(reader.readline(), timeout)
+    if not line:
+        raise ConnectionError("profile daemon closed the connection without replying")
+    message = _loads(line.decode("utf-8"))
+    if not isinstance(message, dict):
+        raise ValueError(f"unexpected profile daemon reply: {message!r}")
+    return message
 
-    # Run the pipeline asynchronously
-    profile = asyncio.run(run_pipeline(name))
 
-    # If the router decided it's not a politician, print friendly message and exit cleanly
+async def _query_daemon(query: str) -> Optional[Dict[str, Any]]:
+    """
+    Send one query to a running profile daemon and return its profile (or None).
+    Raises OSError/ValueError/TimeoutError only before the daemon accepts the query, so the
+    caller can fall back to a local run; later failures are reported here, since the daemon
+    has already spent (or is still spending) the Gemini calls for this query.
+    """
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_unix_connection(DAEMON_SOCKET, limit=DAEMON_LINE_LIMIT), DAEMON_ACK_TIMEOUT
+    )
+    try:
+        request = {"name": query, "debug": bool(os.getenv("PPCLI_DEBUG"))}
+        writer.write(json.dumps(request).encode("utf-8") + b"\n")
+        await writer.drain()
+
+        # The daemon acks right away, or says it is busy with another client
+        ack = await _read_daemon_line(reader, DAEMON_ACK_TIMEOUT)
+        if ack.get("status") != "started":
+            raise ConnectionError(ack.get("error") or f"profile daemon is {ack.get('status') or 'unavailable'}")
+
+        # Past the ack: closing the connection on failure tells the daemon to cancel the run
+        try:
+            with console.status("Building the profile (daemon)…"):
+                reply = await _read_daemon_line(reader, DAEMON_REPLY_TIMEOUT)
+        except (OSError, ValueError, asyncio.TimeoutError) as e:
+            print_run_failure(f"profile daemon did not return a profile ({str(e) or type(e).__name__})")
+            return None
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+
+    if reply.get("error"):
+        print_run_failure(reply["error"], reply.get("traceback"))
+        return None
+    profile = reply.get("profile")
+    if profile is not None and not isinstance(profile, dict):
+        print_run_failure(f"unexpected profile from daemon: {profile!r}")
+        return None
+    return profile
+
+
+async def run_query(query: str) -> Optional[Dict[str, Any]]:
+    """Use the warm daemon if one is listening, otherwise run the pipeline in-process."""
+    if os.path.exists(DAEMON_SOCKET):
+        try:
+            return await _query_daemon(query)
+        except (OSError, ValueError, asyncio.TimeoutError) as e:
+            # Stale socket, busy/wedged daemon or bad ack: nothing ran yet, so run locally
+            console.print(f"[yellow]Profile daemon unavailable ({str(e) or type(e).__name__}); running locally[/yellow]")
+    return await run_pipeline(query)
+
+
+def install_uvloop() -> None:
+    """Use uvloop's event loop when it is installed (it is unavailable on Windows)."""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    uvloop.install()
+
+
+def show_result(profile: Optional[Dict[str, Any]]) -> bool:
+    """Print a pipeline result. Returns False when nothing was produced."""
+    # If the router decided it's not a politician, print friendly message
     if isinstance(profile, dict) and "final_message" in profile:
+        from rich.panel import Panel
+        from rich.text import Text
+
         console.print(Panel.fit(Text(profile["final_message"]), title="Info", border_style="yellow"))
-        return
+        return True
 
     if not profile:
         console.print("[red]No profile produced by the pipeline.[/red]")
-        raise typer.Exit(code=1)
+        return False
 
     # Render the final JSON in a presentable form
     render_profile(profile)
+    return True
+
+
+def repl() -> None:
+    """Profile names in a loop on one event loop, reusing the cached Runner and its clients."""
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            name = typer.prompt("Politician name (blank to quit)", default="", show_default=False)
+            if not name.strip():
+                break
+            show_result(loop.run_until_complete(run_pipeline(name)))
+    finally:
+        loop.close()
+
+
+@app.command(help="Build a concise, validated profile of an Indian politician.")
+def main(
+    name: str = typer.Option(None, "--name", "-n", help="Politician name (if omitted, will prompt)"),
+    interactive: bool = typer.Option(False, "--repl", help="Keep prompting for names until a blank line"),
+):
+    install_uvloop()
+
+    if interactive:
+        repl()
+        return
+
+    # Prompt interactively if not provided as an arg
+    if not name:
+        name = typer.prompt("Enter the politician's name")
+
+    # Run the pipeline asynchronously (via the daemon when it is running)
+    profile = asyncio.run(run_query(name))
+
+    # Exit non-zero when the pipeline produced nothing
+    if not show_result(profile):
+        raise typer.Exit(code=1)
 
 
 if __name__ == "__main__":
@@ -1,22 +1,37 @@
+import asyncio
+import logging
 import os
+import time
+from collections import OrderedDict
 from dotenv import load_dotenv
 
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Dict, List, Optional, Tuple
 from google.adk.tools import google_search
 from google.adk.agents import BaseAgent
 from google.adk.agents.invocation_context import InvocationContext
-from google.adk.events import Event
-from pydantic import BaseModel, Field
+from google.adk.events import Event, EventActions
+from pydantic import BaseModel, Field, ValidationError
 from google.adk.agents import LlmAgent, SequentialAgent, ParallelAgent
+from google.adk.models import Gemini
+from google.adk.planners import BuiltInPlanner
 from google.genai import types
 
 load_dotenv()
 from schemas.disambiguation import DisambiguationResult
 from schemas.profile import ProfileOutput
+from political_profiles_agent.profile_checks import profile_needs_validation
+
+logger = logging.getLogger(__name__)
+
+# Shared model handles: a model given by name is re-instantiated on every call, each with its own
+# genai client. One instance per model keeps one client (and its keep-alive connection pool) for all
+# agents, including the three ParallelResearch searchers.
+flash_model = Gemini(model="gemini-2.5-flash")
+pro_model = Gemini(model="gemini-2.5-pro")
 
 disambiguate = LlmAgent(
     name="DisambiguatePerson",
-    model="gemini-2.5-flash",
+    model=flash_model,
     instruction=(
         "Given a name, determine if it is an Indian politician. "
         "If not a politician, set is_politician=false and explain briefly in notes. "
@@ -38,7 +53,7 @@ disambiguate = LlmAgent(
 
 gov_sources = LlmAgent(
     name="GovSources",
-    model="gemini-2.5-flash",
+    model=flash_model,
     instruction=(
         "Using Google Search, find current official role, ministry/house membership, and portfolio from "
         "government and parliament portals only; produce a concise, citation-rich note."
@@ -49,7 +64,7 @@ gov_sources = LlmAgent(
 
 encyclopedia_sources = LlmAgent(
     name="EncyclopediaSources",
-    model="gemini-2.5-flash",
+    model=flash_model,
     instruction=(
         "Using Google Search, gather education, career timeline, notable achievements from authoritative "
         "encyclopedias and official bios; produce a concise, citation-rich note."
@@ -60,7 +75,7 @@ encyclopedia_sources = LlmAgent(
 # Recent updates: any role changes in last 90 days
 recent_updates = LlmAgent(
     name="RecentUpdates",
-    model="gemini-2.5-flash",
+    model=flash_model,
     instruction=(
         "Using Google Search, capture any role changes or major updates in the last 90 days with sources; "
         "produce a concise, citation-rich note."
@@ -68,16 +83,35 @@ recent_updates = LlmAgent(
     tools=[google_search],
     output_key="recent_note"
 )
+
+
+# Gov lookup that is skipped when the Router already prefetched gov_note
+class PrefetchedGovSources(BaseAgent):
+    def __init__(self, name: str):
+        super().__init__(
+            name=name,
+            description="Runs GovSources unless its note was already prefetched by the Router.",
+            sub_agents=[gov_sources],
+        )
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        if ctx.session.state.get("gov_note"):
+            return
+        async for event in gov_sources.run_async(ctx):
+            yield event
+
+
 # Research in parallel: gov, encyclopedia, recent
+maybe_gov_sources = PrefetchedGovSources(name="MaybeGovSources")
 parallel_research = ParallelAgent(
     name="ParallelResearch",
-    sub_agents=[gov_sources, encyclopedia_sources, recent_updates],
+    sub_agents=[maybe_gov_sources, encyclopedia_sources, recent_updates],
 )
 
 #Consolidate: merge parallel notes into a single fact sheet
 consolidate = LlmAgent(
     name="ConsolidateNotes",
-    model="gemini-2.5-pro",
+    model=pro_model,
     instruction=(
         "Synthesize the gov_note, encyc_note, and recent_note into a single, internally consistent fact sheet, "
         "resolving conflicts by preferring official/government sources and the most recent authoritative updates; "
@@ -87,34 +121,78 @@ consolidate = LlmAgent(
 )
 
 # Extract structured profile from the consolidated fact sheet
-extract_structured = LlmAgent(
-    name="ExtractProfile",
-    model="gemini-2.5-flash",
-    instruction=(
-        "Use fact_sheet to produce ONLY a JSON object with exactly these keys: "
-        "title, biography, current_status. "
-        "title: If the politician holds any post now, output only the current office title without years "
-        "(e.g., 'Prime Minister of India', 'Leader of the Opposition in Lok Sabha', 'Chief Minister of Uttar Pradesh'). "
-        "Only if no current post exists, set title to 'Former highest role (years)' including service years if known. "
-        "biography: 8–12 sentences including education, career, and achievements. "
-        "current_status: clearly state present roles and responsibilities or 'Not in office' with the latest update. "
-        "Return ONLY valid JSON, no markdown, no commentary."
-    ),
-    output_schema=ProfileOutput,
-    generate_content_config=types.GenerateContentConfig(
-        temperature=0.2,
-        response_mime_type="application/json",
-        max_output_tokens=2000,
-    ),
-    output_key="structured_profile",
-    disallow_transfer_to_parent=True,
-    disallow_transfer_to_peers=True,
-)
+def _make_extractor(name: str, max_output_tokens: int, thinking_budget: Optional[int] = None) -> LlmAgent:
+    # gemini-2.5-flash thinks by default and thinking tokens count against max_output_tokens
+    planner = None
+    if thinking_budget is not None:
+        planner = BuiltInPlanner(thinking_config=types.ThinkingConfig(thinking_budget=thinking_budget))
+    return LlmAgent(
+        name=name,
+        planner=planner,
+        model=flash_model,
+        instruction=(
+            "Use fact_sheet to produce ONLY a JSON object with exactly these keys: "
+            "title, biography, current_status. "
+            "title: If the politician holds any post now, output only the current office title without years "
+            "(e.g., 'Prime Minister of India', 'Leader of the Opposition in Lok Sabha', 'Chief Minister of Uttar Pradesh'). "
+            "Only if no current post exists, set title to 'Former highest role (years)' including service years if known. "
+            "biography: 8–12 sentences including education, career, and achievements. "
+            "current_status: clearly state present roles and responsibilities or 'Not in office' with the latest update. "
+            "Return ONLY valid JSON, no markdown, no commentary."
+        ),
+        output_schema=ProfileOutput,
+        generate_content_config=types.GenerateContentConfig(
+            temperature=0.2,
+            response_mime_type="application/json",
+            max_output_tokens=max_output_tokens,
+        ),
+        output_key="structured_profile",
+        disallow_transfer_to_parent=True,
+        disallow_transfer_to_peers=True,
+    )
+
+
+# Try a short output budget (with thinking off, so it all goes to the JSON) first;
+# fall back to the full budget if the JSON comes back cut off
+extract_structured = _make_extractor("ExtractProfile", max_output_tokens=800, thinking_budget=0)
+extract_structured_full = _make_extractor("ExtractProfileFull", max_output_tokens=2000)
+
+
+def _is_valid_profile(profile) -> bool:
+    try:
+        ProfileOutput.model_validate(profile)
+    except ValidationError:
+        return False
+    return True
+
+
+class RetryingExtractAgent(BaseAgent):
+    def __init__(self, name: str):
+        super().__init__(
+            name=name,
+            description="Runs ExtractProfile with a small token cap, retrying with the full cap on truncated output.",
+            sub_agents=[extract_structured, extract_structured_full],
+        )
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        try:
+            async for event in extract_structured.run_async(ctx):
+                yield event
+        except ValidationError:
+            # ADK validates output_schema on the final reply; truncated JSON fails here
+            pass
+        else:
+            if _is_valid_profile(ctx.session.state.get("structured_profile")):
+                return
+
+        async for event in extract_structured_full.run_async(ctx):
+            yield event
+
 
 # Validate and correct the extracted profile
 validator = LlmAgent(
     name="ValidateProfile",
-    model="gemini-2.5-flash",
+    model=flash_model,
     instruction=(
         "Validate and correct structured_profile using fact_sheet and prior notes so that: "
         "1) If a current post exists, title is only the current office (no years); "
@@ -134,11 +212,34 @@ validator = LlmAgent(
     disallow_transfer_to_peers=True,
 )
 
+# Run the validator only when the extracted profile breaks a locally checkable rule
+class MaybeValidator(BaseAgent):
+    def __init__(self, name: str):
+        super().__init__(
+            name=name,
+            description="Promotes structured_profile to final_profile, calling ValidateProfile only if needed.",
+            sub_agents=[validator],
+        )
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        profile = ctx.session.state.get("structured_profile")
+        if profile_needs_validation(profile):
+            async for event in validator.run_async(ctx):
+                yield event
+            return
+
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta={"final_profile": profile}),
+        )
+
 
 # friendly quick message agent when the name entered is not a politician
 not_a_politician = LlmAgent(
     name="NotAPolitician",
-    model="gemini-2.5-flash",
+    model=flash_model,
     instruction=(
         "Write a short, friendly message saying the entered name does not appear to be an Indian politician. "
         "Suggest entering the name of a political figure (e.g., an MP/MLA, Chief Minister, or Union Minister). "
@@ -155,9 +256,51 @@ not_a_politician = LlmAgent(
 # research → consolidate → extract → validate pipeline
 research_pipeline = SequentialAgent(
     name="ResearchPipeline",
-    sub_agents=[parallel_research, consolidate, extract_structured, validator],
+    sub_agents=[
+        parallel_research,
+        consolidate,
+        RetryingExtractAgent(name="ExtractWithRetry"),
+        MaybeValidator(name="CheckProfile"),
+    ],
     description="Research → Consolidate → Structure → Validate",
 )
+# In-process LRU of disambiguation results keyed by normalized query
+# Entries are (stored at, entity_grounding, DisambiguatePerson reply); the TTL matches the
+# CLI's profile memo so long-lived processes re-check names, including negative verdicts
+_DISAMBIGUATION_CACHE: "OrderedDict[str, Tuple[float, Dict, types.Content]]" = OrderedDict()
+_DISAMBIGUATION_CACHE_SIZE = 256
+_DISAMBIGUATION_CACHE_TTL = 15 * 60  # seconds
+
+
+def _query_key(ctx: InvocationContext) -> str:
+    """Normalized user query text used as the disambiguation cache key."""
+    content = ctx.user_content
+    text = "".join(part.text or "" for part in (content.parts or [])) if content else ""
+    return text.strip().casefold()
+
+
+def _cached_grounding(key: str) -> Optional[Tuple[Dict, types.Content]]:
+    entry = _DISAMBIGUATION_CACHE.get(key) if key else None
+    if entry is None:
+        return None
+    stored_at, gate, content = entry
+    if time.monotonic() - stored_at > _DISAMBIGUATION_CACHE_TTL:
+        del _DISAMBIGUATION_CACHE[key]
+        return None
+    _DISAMBIGUATION_CACHE.move_to_end(key)
+    return gate, content
+
+
+def _remember_grounding(key: str, gate: Dict, content: Optional[types.Content]) -> None:
+    # Keep DisambiguatePerson's reply too, so a cache hit leaves the same history as a miss
+    if not key or not gate or not isinstance(gate, dict) or content is None:
+        return
+    _DISAMBIGUATION_CACHE[key] = (time.monotonic(), dict(gate), content.model_copy(deep=True))
+    _DISAMBIGUATION_CACHE.move_to_end(key)
+    if len(_DISAMBIGUATION_CACHE) > _DISAMBIGUATION_CACHE_SIZE:
+        _DISAMBIGUATION_CACHE.popitem(last=False)
+
+
 # Router agent: disambiguate → (not_a_politician | research_pipeline)
 class Router(BaseAgent):
     def __init__(self, name: str):
@@ -167,21 +310,72 @@ class Router(BaseAgent):
             sub_agents=[disambiguate, not_a_politician, research_pipeline],
         )
 
+    async def _run_gov_sources(self, ctx: InvocationContext) -> List[Event]:
+        # Buffer events: they can only reach the session once the Router yields them.
+        # Safe because google_search is a built-in tool (no client-side function-call turns).
+        # Run on the branch ParallelAgent would assign, so the replayed events stay hidden
+        # from the sibling researchers exactly as if GovSources had run inside ParallelResearch.
+        branch = f"{parallel_research.name}.{maybe_gov_sources.name}"
+        if ctx.branch:
+            branch = f"{ctx.branch}.{branch}"
+        branch_ctx = ctx.model_copy(update={"branch": branch})
+        return [event async for event in gov_sources.run_async(branch_ctx)]
+
     async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
-        # 1) Run fast disambiguation
-        async for event in disambiguate.run_async(ctx):
-            yield event
+        key = _query_key(ctx)
+        cached = _cached_grounding(key)
+
+        # 0) Speculatively start the gov lookup; most queries are politicians
+        prefetch = None
+        if cached is None or cached[0].get("is_politician"):
+            prefetch = asyncio.create_task(self._run_gov_sources(ctx))
+
+        # 1) Run fast disambiguation, or replay the cached reply for a repeated name
+        reply_content = None
+        try:
+            if cached is not None:
+                cached_gate, cached_content = cached
+                yield Event(
+                    invocation_id=ctx.invocation_id,
+                    author=disambiguate.name,
+                    branch=ctx.branch,
+                    content=cached_content.model_copy(deep=True),
+                    actions=EventActions(state_delta={"entity_grounding": dict(cached_gate)}),
+                )
+            else:
+                async for event in disambiguate.run_async(ctx):
+                    if event.author == disambiguate.name and event.content:
+                        reply_content = event.content
+                    yield event
+        except BaseException:
+            if prefetch is not None:
+                prefetch.cancel()
+            raise
 
         gate = ctx.session.state.get("entity_grounding") or {}
         is_pol = bool(gate.get("is_politician"))
+        if cached is None:
+            _remember_grounding(key, gate, reply_content)
 
         # 2) Quick exit with friendly message if not a politician
         if not is_pol:
+            if prefetch is not None:
+                prefetch.cancel()
             async for event in not_a_politician.run_async(ctx):
                 yield event
             return
 
-        # 3) Otherwise, proceed with the full research pipeline
+        # 3) Replay the prefetched gov events so gov_note lands in session state;
+        #    on failure MaybeGovSources simply runs the lookup again inside the pipeline
+        try:
+            prefetched = await prefetch
+        except Exception:
+            logger.warning("GovSources prefetch failed; rerunning it in ParallelResearch", exc_info=True)
+            prefetched = []
+        for event in prefetched:
+            yield event
+
+        # 4) Proceed with the full research pipeline
         async for event in research_pipeline.run_async(ctx):
             yield event
 
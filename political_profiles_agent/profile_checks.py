@@ -0,0 +1,42 @@
+import re
+
+_YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+_SENTENCE_END_RE = re.compile(r"[.!?]+(?=\s|$)")
+# Any hint that the person is out of office sends the profile to the LLM validator
+_OUT_OF_OFFICE_RE = re.compile(
+    r"\b(?:not in office|no longer|former(?:ly)?|lost|defeated|resigned|retired|stepped down|"
+    r"holds no|held no|out of office|ex-|died|passed away|late)\b",
+    re.IGNORECASE,
+)
+# A current_status must positively describe a present role for the validator to be skipped
+_PRESENT_ROLE_RE = re.compile(
+    r"\b(?:currently|presently|serves|serving|incumbent|holds|is the|is a member)\b",
+    re.IGNORECASE,
+)
+
+
+def profile_needs_validation(profile) -> bool:
+    """
+    Cheap local check of the validator's rules; True means the LLM validator should run.
+    Only a complete, in-office profile with a year-free current title and an 8–12 sentence
+    biography skips it. Out-of-office or ambiguous statuses always go to the validator, since
+    the former-role title and rule 4 (latest sources) cannot be checked locally.
+    """
+    if not isinstance(profile, dict):
+        return True
+    title = profile.get("title")
+    biography = profile.get("biography")
+    current_status = profile.get("current_status")
+    if not all(isinstance(v, str) and v.strip() for v in (title, biography, current_status)):
+        return True
+
+    # current_status must clearly describe a present role, with no out-of-office signal
+    if _OUT_OF_OFFICE_RE.search(current_status) or not _PRESENT_ROLE_RE.search(current_status):
+        return True
+    # 1) a current office title carries no years and does not read as a former role
+    if _YEAR_RE.search(title) or _OUT_OF_OFFICE_RE.search(title):
+        return True
+    # 3) biography length stays within 8–12 sentences
+    if not 8 <= len(_SENTENCE_END_RE.findall(biography)) <= 12:
+        return True
+    return False
@@ -0,0 +1,133 @@
+# profile_daemon.py
+"""
+Keep the ADK runner, Gemini clients and result cache warm in one background process.
+
+Start it with `python profile_daemon.py`; `python main.py --name ...` then forwards the
+query over a UNIX socket instead of importing ADK itself. Protocol (one JSON object per line):
+client sends {"name": ..., "debug": bool}; daemon answers {"status": "started"} (or
+{"status": "busy"} and closes), then {"profile": ...} or {"profile": null, "error": ..., "traceback": ...}.
+"""
+import asyncio
+import json
+import os
+import traceback
+from typing import Any, Dict, Optional
+
+from main import (
+    DAEMON_LINE_LIMIT,
+    DAEMON_SOCKET,
+    build_profile,
+    console,
+    get_runner,
+    install_uvloop,
+    print_run_failure,
+)
+
+
+def _send(writer: asyncio.StreamWriter, message: Dict[str, Any]) -> None:
+    writer.write(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+
+
+async def _run_for_client(name: str, debug: bool, reader: asyncio.StreamReader) -> Optional[Dict[str, Any]]:
+    """Build the profile, cancelling it if the client disconnects first (returns None then)."""
+    run = asyncio.ensure_future(build_profile(name))
+    # The client sends nothing after its request, so any read completing means it hung up
+    hangup = asyncio.ensure_future(reader.read(1))
+    try:
+        await asyncio.wait({run, hangup}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in (run, hangup):
+            if not task.done():
+                task.cancel()
+    if not run.done() or run.cancelled():
+        # Let the cancelled run unwind (spinner, session) before the lock is released
+        await asyncio.gather(run, return_exceptions=True)
+        console.print(f"[yellow]Client disconnected; cancelled the run for {name!r}[/yellow]")
+        return None
+
+    try:
+        return {"profile": run.result()}
+    except Exception as e:
+        tb = traceback.format_exc()
+        print_run_failure(str(e), tb if os.getenv("PPCLI_DEBUG") else None)
+        reply = {"profile": None, "error": str(e) or type(e).__name__}
+        if debug:
+            reply["traceback"] = tb
+        return reply
+
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, lock: asyncio.Lock) -> None:
+    try:
+        line = await reader.readline()
+        if not line:
+            return  # liveness probe from _daemon_running
+        try:
+            request = json.loads(line.decode("utf-8"))
+        except ValueError:
+            request = None
+        name = request.get("name") if isinstance(request, dict) else None
+        if not isinstance(name, str) or not name.strip():
+            _send(writer, {"status": "error", "error": "request must be a JSON object with a non-empty 'name'"})
+            await writer.drain()
+            return
+
+        # One run at a time (the spinner is a single Rich live display); let the client
+        # fall back to a local run instead of queueing behind another one
+        if lock.locked():
+            _send(writer, {"status": "busy"})
+            await writer.drain()
+            return
+
+        async with lock:
+            _send(writer, {"status": "started"})
+            await writer.drain()
+            reply = await _run_for_client(name, bool(request.get("debug")), reader)
+            if reply is None:
+                return  # client went away; the run was cancelled
+            _send(writer, reply)
+            await writer.drain()
+    except ConnectionError:
+        pass  # client went away; nothing to report
+    finally:
+        writer.close()
+
+
+async def _daemon_running() -> bool:
+    try:
+        _, writer = await asyncio.open_unix_connection(DAEMON_SOCKET)
+    except OSError:
+        return False
+    writer.close()
+    return True
+
+
+async def serve() -> None:
+    if os.path.exists(DAEMON_SOCKET):
+        if await _daemon_running():
+            console.print(f"[yellow]A profile daemon is already listening on {DAEMON_SOCKET}[/yellow]")
+            return
+        os.unlink(DAEMON_SOCKET)  # left behind by a daemon that did not shut down cleanly
+
+    # Pay the ADK/genai import and agent construction cost once, up front
+    get_runner()
+
+    os.makedirs(os.path.dirname(DAEMON_SOCKET), exist_ok=True)
+    lock = asyncio.Lock()
+    server = await asyncio.start_unix_server(
+        lambda r, w: _handle(r, w, lock), path=DAEMON_SOCKET, limit=DAEMON_LINE_LIMIT
+    )
+    console.print(f"[green]Profile daemon listening on {DAEMON_SOCKET}[/green]")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if os.path.exists(DAEMON_SOCKET):
+            os.unlink(DAEMON_SOCKET)
+
+
+if __name__ == "__main__":
+    install_uvloop()
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
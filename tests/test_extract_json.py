@@ -0,0 +1,32 @@
+import time
+
+from main import _extract_json
+
+
+def test_bare_and_fenced_json():
+    assert _extract_json('{"title": "Prime Minister of India"}') == {"title": "Prime Minister of India"}
+    assert _extract_json('```json\n{"title": "MP"}\n```') == {"title": "MP"}
+
+
+def test_cited_fact_sheet_is_not_json():
+    fact_sheet = (
+        "Narendra Modi is the Prime Minister of India [1]. "
+        "He was Chief Minister of Gujarat from 2001 to 2014 [1, 2]."
+    )
+    assert _extract_json(fact_sheet) is None
+
+
+def test_object_after_citation():
+    text = 'Sources agree [1]. {"title": "Prime Minister of India", "note": "see [2] {x}"} trailing'
+    assert _extract_json(text) == {"title": "Prime Minister of India", "note": "see [2] {x}"}
+
+
+def test_invalid_object_then_valid_object():
+    assert _extract_json('prose {not json} more {"title": "MLA"}') == {"title": "MLA"}
+
+
+def test_deep_nesting_stays_linear():
+    text = "prose " + "{" * 8000 + "}" * 8000 + " " + "[" * 8000 + "]" * 8000
+    started = time.perf_counter()
+    assert _extract_json(text) is None
+    assert time.perf_counter() - started < 1.0
@@ -0,0 +1,41 @@
+from political_profiles_agent.profile_checks import profile_needs_validation
+
+BIOGRAPHY = " ".join(f"Sentence number {i} about the career." for i in range(10))
+
+
+def _profile(title, current_status, biography=BIOGRAPHY):
+    return {"title": title, "biography": biography, "current_status": current_status}
+
+
+def test_clean_in_office_profile_skips_validation():
+    profile = _profile("Prime Minister of India", "Currently serves as Prime Minister of India since 2014.")
+    assert profile_needs_validation(profile) is False
+
+
+def test_out_of_office_status_with_current_title_is_validated():
+    for status in (
+        "He is no longer in office since 2019.",
+        "Lost the 2024 election and currently holds no office.",
+        "Not in office; latest update from 2023.",
+        "Resigned in 2022 and is currently a party worker.",
+        "Retired from active politics.",
+        "Former Chief Minister, currently serving as a party adviser.",
+    ):
+        assert profile_needs_validation(_profile("Prime Minister of India", status)) is True, status
+
+
+def test_status_without_present_role_is_validated():
+    assert profile_needs_validation(_profile("Member of Parliament", "Details unclear.")) is True
+
+
+def test_years_or_former_in_title_is_validated():
+    status = "Currently serves as Chief Minister of Uttar Pradesh."
+    assert profile_needs_validation(_profile("Chief Minister of Uttar Pradesh (2017–present)", status)) is True
+    assert profile_needs_validation(_profile("Former Chief Minister of Uttar Pradesh", status)) is True
+
+
+def test_biography_length_and_missing_fields_are_validated():
+    status = "Currently serves as Prime Minister of India."
+    assert profile_needs_validation(_profile("Prime Minister of India", status, biography="Too short.")) is True
+    assert profile_needs_validation({"title": "Prime Minister of India"}) is True
+    assert profile_needs_validation("not a dict") is True